@@ -1,10 +1,19 @@
 from flask import Flask
 from controllers.trace_controller import trace_bp
 
+try:
+    from flask_compress import Compress
+except ImportError:  # pragma: no cover - depends on the environment
+    Compress = None
+
 
 def create_app():
     app = Flask(__name__)
     app.register_blueprint(trace_bp)
+    if Compress is not None:
+        # Brotli/gzip for the JSON payloads; traceability output is highly
+        # redundant text and shrinks ~10x on the wire.
+        Compress(app)
     return app
 
 
@@ -1,8 +1,24 @@
-from flask import Blueprint, jsonify, render_template, request
+import copy
+from functools import lru_cache
+
+from flask import Blueprint, current_app, jsonify, render_template, request
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 from models.sql_trace_model import SqlTraceModel
 
 trace_bp = Blueprint("trace", __name__)
 
+_ANALYZER = SqlTraceModel()
+
+
+@lru_cache(maxsize=1024)
+def _analyze_cached(sql_text: str):
+    return _ANALYZER.analyze(sql_text)
+
 
 @trace_bp.get("/")
 def index():
@@ -13,6 +29,11 @@ def index():
 def analyze_sql():
     payload = request.get_json(silent=True) or {}
     sql_text = payload.get("sql", "")
-    analyzer = SqlTraceModel()
-    results = analyzer.analyze(sql_text)
-    return jsonify(results)
+    results = _analyze_cached(sql_text)
+    if orjson is not None:
+        # orjson serializes the cached dict without touching it, so no
+        # defensive copy is needed on this path.
+        return current_app.response_class(
+            orjson.dumps(results), mimetype="application/json"
+        )
+    return jsonify(copy.deepcopy(results))
@@ -0,0 +1,24 @@
+"""Small collection helpers shared by the models."""
+
+from typing import List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def dedup(seq: Sequence[T]) -> List[T]:
+    """Drop duplicates while preserving first-seen order.
+
+    Skips the dict that list(dict.fromkeys(...)) would build; the common
+    zero/one-element case returns immediately.
+    """
+    if len(seq) < 2:
+        return list(seq)
+    seen = set()
+    out: List[T] = []
+    mark_seen = seen.add
+    emit = out.append
+    for item in seq:
+        if item not in seen:
+            mark_seen(item)
+            emit(item)
+    return out
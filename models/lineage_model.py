@@ -1,10 +1,25 @@
 import re
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
+
+from models.collection_utils import dedup
+from models.regex_compat import compile_pattern
+
+_WS_RE = compile_pattern(r"\s+")
+_FROM_RE = compile_pattern(r"\bFROM\s+([^\s,;]+)", re.IGNORECASE)
+_JOIN_RE = compile_pattern(r"\bJOIN\s+([^\s,;]+)", re.IGNORECASE)
+_USING_RE = compile_pattern(r"\bUSING\s+([^\s,;]+)", re.IGNORECASE)
 
 
 class LineageModel:
-    def analyze(self, statement: str, action: str, objects: List[str]) -> Dict[str, object]:
-        normalized = self._normalize(statement)
+    def analyze(
+        self,
+        statement: str,
+        action: str,
+        objects: List[str],
+        normalized: Optional[str] = None,
+    ) -> Dict[str, object]:
+        if normalized is None:
+            normalized = self._normalize(statement)
         sources = self._extract_sources(normalized)
         targets: List[str] = []
 
@@ -36,12 +51,11 @@ class LineageModel:
 
     def _extract_sources(self, normalized: str) -> List[str]:
         sources: List[str] = []
-        from_matches = re.findall(r"\bFROM\s+([^\s,;]+)", normalized, flags=re.IGNORECASE)
-        join_matches = re.findall(r"\bJOIN\s+([^\s,;]+)", normalized, flags=re.IGNORECASE)
-        using_matches = re.findall(r"\bUSING\s+([^\s,;]+)", normalized, flags=re.IGNORECASE)
-        sources.extend(from_matches + join_matches + using_matches)
-        return list(dict.fromkeys(sources))
+        sources.extend(_FROM_RE.findall(normalized))
+        sources.extend(_JOIN_RE.findall(normalized))
+        sources.extend(_USING_RE.findall(normalized))
+        return dedup(sources)
 
     @staticmethod
     def _normalize(statement: str) -> str:
-        return re.sub(r"\s+", " ", statement.strip()).upper()
+        return _WS_RE.sub(" ", statement.strip()).upper()
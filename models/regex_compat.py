@@ -0,0 +1,16 @@
+"""Optional google-re2 backend for the models' precompiled patterns.
+
+pyre2 compiles patterns to a DFA, so matching never backtracks and runs in
+linear time regardless of pattern shape. Its API matches the stdlib for the
+features used by the models (alternations, named groups, word boundaries).
+When it is not installed, the stdlib engine is used unchanged.
+"""
+
+try:
+    import re2 as _engine
+except ImportError:  # pragma: no cover - depends on the environment
+    import re as _engine
+
+
+def compile_pattern(pattern: str, flags: int = 0):
+    return _engine.compile(pattern, flags)
@@ -0,0 +1,26 @@
+# cython: language_level=3
+"""Compiled hot-path helpers for the SQL models.
+
+Built via ``python setup.py build_ext --inplace`` when Cython is installed;
+the models fall back to their pure-Python implementations when this
+extension is absent.
+"""
+
+
+def comma_offsets(bytes buf):
+    """Byte offsets of commas at paren depth 0; 40/41/44 are ( ) ,"""
+    cdef Py_ssize_t index
+    cdef Py_ssize_t length = len(buf)
+    cdef Py_ssize_t depth = 0
+    cdef unsigned char code
+    offsets = []
+    for index in range(length):
+        code = buf[index]
+        if code == 40:
+            depth += 1
+        elif code == 41:
+            if depth > 0:
+                depth -= 1
+        elif code == 44 and depth == 0:
+            offsets.append(index)
+    return offsets
@@ -1,10 +1,78 @@
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
+from models.collection_utils import dedup
 from models.lineage_model import LineageModel
+from models.regex_compat import compile_pattern
 from models.traceability_model import TraceabilityModel
 
+_WS_RE = compile_pattern(r"\s+")
+_STMT_RE = compile_pattern(r"[^;]+")
+
+# Scripts with at least this many statements are fanned out to worker
+# processes; below it, fork/pickle overhead outweighs the parallelism.
+_PARALLEL_THRESHOLD = 32
+
+_OBJECT_PATTERNS = {
+    key: compile_pattern(pattern, re.IGNORECASE)
+    for key, pattern in {
+        "CREATE TABLE": r"CREATE\s+TABLE\s+([^\s(]+)",
+        "DROP TABLE": r"DROP\s+TABLE\s+([^\s;]+)",
+        "TRUNCATE TABLE": r"TRUNCATE\s+TABLE\s+([^\s;]+)",
+        "ALTER TABLE": r"ALTER\s+TABLE\s+([^\s;]+)",
+        "RENAME TABLE": r"RENAME\s+TABLE\s+([^\s;]+)",
+        "CREATE VIEW": r"CREATE\s+VIEW\s+([^\s;]+)",
+        "DROP VIEW": r"DROP\s+VIEW\s+([^\s;]+)",
+        "CREATE INDEX": r"CREATE\s+INDEX\s+([^\s;]+)",
+        "DROP INDEX": r"DROP\s+INDEX\s+([^\s;]+)",
+        "CREATE SEQUENCE": r"CREATE\s+SEQUENCE\s+([^\s;]+)",
+        "DROP SEQUENCE": r"DROP\s+SEQUENCE\s+([^\s;]+)",
+        "CREATE FUNCTION": r"CREATE\s+FUNCTION\s+([^\s(]+)",
+        "DROP FUNCTION": r"DROP\s+FUNCTION\s+([^\s(]+)",
+        "CREATE PROCEDURE": r"CREATE\s+PROCEDURE\s+([^\s(]+)",
+        "DROP PROCEDURE": r"DROP\s+PROCEDURE\s+([^\s(]+)",
+        "CREATE TRIGGER": r"CREATE\s+TRIGGER\s+([^\s;]+)",
+        "DROP TRIGGER": r"DROP\s+TRIGGER\s+([^\s;]+)",
+        "CREATE DATABASE": r"CREATE\s+DATABASE\s+([^\s;]+)",
+        "DROP DATABASE": r"DROP\s+DATABASE\s+([^\s;]+)",
+        "CREATE SCHEMA": r"CREATE\s+SCHEMA\s+([^\s;]+)",
+        "DROP SCHEMA": r"DROP\s+SCHEMA\s+([^\s;]+)",
+        "INSERT": r"INSERT\s+INTO\s+([^\s(]+)",
+        "UPDATE": r"UPDATE\s+([^\s;]+)",
+        "DELETE": r"DELETE\s+FROM\s+([^\s;]+)",
+        "MERGE": r"MERGE\s+INTO\s+([^\s;]+)",
+        "SELECT": r"FROM\s+([^\s,;]+)",
+        "GRANT": r"GRANT\s+[^\s]+\s+ON\s+([^\s;]+)",
+        "REVOKE": r"REVOKE\s+[^\s]+\s+ON\s+([^\s;]+)",
+        "DESCRIBE": r"DESCRIBE\s+([^\s;]+)",
+        "EXPLAIN": r"EXPLAIN\s+([^\s;]+)",
+        "EXPLAIN ANALYZE": r"EXPLAIN\s+ANALYZE\s+([^\s;]+)",
+        "SHOW": r"SHOW\s+([^;]+)",
+        "USE": r"USE\s+([^;]+)",
+    }.items()
+}
+_SELECT_FROM_RE = _OBJECT_PATTERNS["SELECT"]
+
+
+def _build_trie(keywords) -> Dict[str, object]:
+    """Map each keyword into nested char dicts; "$" marks an accepting node."""
+    trie: Dict[str, object] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node["$"] = keyword
+    return trie
+
 
 @dataclass
 class TraceResult:
@@ -17,230 +85,336 @@ class TraceResult:
 
 
 class SqlTraceModel:
-    DDL_ACTIONS = {
-        "CREATE DATABASE",
-        "DROP DATABASE",
-        "CREATE SCHEMA",
-        "DROP SCHEMA",
-        "CREATE TABLE",
-        "DROP TABLE",
-        "TRUNCATE TABLE",
-        "ALTER TABLE",
-        "RENAME TABLE",
-        "CREATE VIEW",
-        "DROP VIEW",
-        "CREATE INDEX",
-        "DROP INDEX",
-        "CREATE SEQUENCE",
-        "DROP SEQUENCE",
-        "CREATE FUNCTION",
-        "DROP FUNCTION",
-        "CREATE PROCEDURE",
-        "DROP PROCEDURE",
-        "CREATE TRIGGER",
-        "DROP TRIGGER",
-    }
-    DML_ACTIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "MERGE"}
-    DCL_ACTIONS = {"GRANT", "REVOKE"}
-    TCL_ACTIONS = {
-        "BEGIN",
-        "START TRANSACTION",
-        "COMMIT",
-        "ROLLBACK",
-        "SAVEPOINT",
-        "SET TRANSACTION",
-    }
-    UTILITY_ACTIONS = {"DESCRIBE", "EXPLAIN", "EXPLAIN ANALYZE", "SHOW", "USE"}
-
-    CLAUSES = {
-        "FROM",
-        "WHERE",
-        "GROUP BY",
-        "HAVING",
-        "ORDER BY",
-        "LIMIT",
-        "OFFSET",
-        "FETCH",
-        "DISTINCT",
-        "AS",
-        "JOIN",
-        "INNER JOIN",
-        "LEFT JOIN",
-        "RIGHT JOIN",
-        "FULL JOIN",
-        "CROSS JOIN",
-        "SELF JOIN",
-        "PARTITION BY",
-    }
+    DDL_ACTIONS = frozenset(
+        sys.intern(keyword)
+        for keyword in {
+            "CREATE DATABASE",
+            "DROP DATABASE",
+            "CREATE SCHEMA",
+            "DROP SCHEMA",
+            "CREATE TABLE",
+            "DROP TABLE",
+            "TRUNCATE TABLE",
+            "ALTER TABLE",
+            "RENAME TABLE",
+            "CREATE VIEW",
+            "DROP VIEW",
+            "CREATE INDEX",
+            "DROP INDEX",
+            "CREATE SEQUENCE",
+            "DROP SEQUENCE",
+            "CREATE FUNCTION",
+            "DROP FUNCTION",
+            "CREATE PROCEDURE",
+            "DROP PROCEDURE",
+            "CREATE TRIGGER",
+            "DROP TRIGGER",
+        }
+    )
+    DML_ACTIONS = frozenset(
+        sys.intern(keyword)
+        for keyword in {"SELECT", "INSERT", "UPDATE", "DELETE", "MERGE"}
+    )
+    DCL_ACTIONS = frozenset(
+        sys.intern(keyword) for keyword in {"GRANT", "REVOKE"}
+    )
+    TCL_ACTIONS = frozenset(
+        sys.intern(keyword)
+        for keyword in {
+            "BEGIN",
+            "START TRANSACTION",
+            "COMMIT",
+            "ROLLBACK",
+            "SAVEPOINT",
+            "SET TRANSACTION",
+        }
+    )
+    UTILITY_ACTIONS = frozenset(
+        sys.intern(keyword)
+        for keyword in {"DESCRIBE", "EXPLAIN", "EXPLAIN ANALYZE", "SHOW", "USE"}
+    )
 
-    FUNCTIONS = {
-        "COUNT",
-        "SUM",
-        "AVG",
-        "MIN",
-        "MAX",
-        "UPPER",
-        "LOWER",
-        "LENGTH",
-        "SUBSTRING",
-        "TRIM",
-        "COALESCE",
-        "NULLIF",
-        "CAST",
-        "CONVERT",
-        "CURRENT_DATE",
-        "CURRENT_TIME",
-        "CURRENT_TIMESTAMP",
-        "NOW",
-        "DATEADD",
-        "DATEDIFF",
-        "EXTRACT",
-        "OVER",
-        "ROW_NUMBER",
-        "RANK",
-        "DENSE_RANK",
-        "LAG",
-        "LEAD",
+    ALL_ACTIONS = (
+        DDL_ACTIONS | DML_ACTIONS | DCL_ACTIONS | TCL_ACTIONS | UTILITY_ACTIONS
+    )
+    _ACTION_TRIE = _build_trie(ALL_ACTIONS)
+    _ACTION_TO_CATEGORY = {
+        **{action: "DDL" for action in DDL_ACTIONS},
+        **{action: "DML" for action in DML_ACTIONS},
+        **{action: "DCL" for action in DCL_ACTIONS},
+        **{action: "TCL" for action in TCL_ACTIONS},
+        **{action: "UTILITY" for action in UTILITY_ACTIONS},
     }
 
+    CLAUSES = frozenset(
+        sys.intern(keyword)
+        for keyword in {
+            "FROM",
+            "WHERE",
+            "GROUP BY",
+            "HAVING",
+            "ORDER BY",
+            "LIMIT",
+            "OFFSET",
+            "FETCH",
+            "DISTINCT",
+            "AS",
+            "JOIN",
+            "INNER JOIN",
+            "LEFT JOIN",
+            "RIGHT JOIN",
+            "FULL JOIN",
+            "CROSS JOIN",
+            "SELF JOIN",
+            "PARTITION BY",
+        }
+    )
+
+    _CLAUSE_LIST = sorted(CLAUSES, key=len, reverse=True)
+    _CLAUSE_ID = {clause: index for index, clause in enumerate(_CLAUSE_LIST)}
+    _CLAUSE_RE = compile_pattern(
+        r"\b("
+        + "|".join(
+            re.escape(clause).replace("\\ ", " ") for clause in _CLAUSE_LIST
+        )
+        + r")\b"
+    )
+
+    FUNCTIONS = frozenset(
+        sys.intern(keyword)
+        for keyword in {
+            "COUNT",
+            "SUM",
+            "AVG",
+            "MIN",
+            "MAX",
+            "UPPER",
+            "LOWER",
+            "LENGTH",
+            "SUBSTRING",
+            "TRIM",
+            "COALESCE",
+            "NULLIF",
+            "CAST",
+            "CONVERT",
+            "CURRENT_DATE",
+            "CURRENT_TIME",
+            "CURRENT_TIMESTAMP",
+            "NOW",
+            "DATEADD",
+            "DATEDIFF",
+            "EXTRACT",
+            "OVER",
+            "ROW_NUMBER",
+            "RANK",
+            "DENSE_RANK",
+            "LAG",
+            "LEAD",
+        }
+    )
+
+    # Only these actions can ever yield lineage targets; everything else
+    # would run LineageModel just to get {} back.
+    _LINEAGE_ACTIONS = frozenset(
+        {"CREATE VIEW", "CREATE TABLE", "INSERT", "MERGE", "UPDATE"}
+    )
+
     def __init__(self) -> None:
         self._traceability = TraceabilityModel()
         self._lineage = LineageModel()
 
     def analyze(self, sql_text: str) -> Dict[str, object]:
         statements = self._split_statements(sql_text)
-        traces: List[TraceResult] = []
+        traces: List[Dict[str, object]] = []
         traceability_rows: List[Dict[str, object]] = []
         lineage_edges: List[Dict[str, str]] = []
         lineage_nodes: Set[str] = set()
 
-        for statement in statements:
-            action = self._detect_action(statement)
-            category = self._detect_category(action)
-            objects = self._extract_objects(statement, action)
-            clauses = self._detect_clauses(statement)
-            functions = self._detect_functions(statement)
-
-            traces.append(
-                TraceResult(
-                    statement=statement,
-                    category=category,
-                    action=action,
-                    objects=objects,
-                    clauses=clauses,
-                    functions=functions,
-                )
-            )
-
-            traceability_rows.extend(self._traceability.analyze(statement))
-
-            lineage = self._lineage.analyze(statement, action, objects)
+        if len(statements) >= _PARALLEL_THRESHOLD:
+            results = _get_executor().map(_analyze_statement_worker, statements)
+        else:
+            results = (self._analyze_statement(statement) for statement in statements)
+
+        for trace, statement_rows, lineage in results:
+            traces.append(trace)
+            traceability_rows.extend(statement_rows)
             if lineage:
                 lineage_nodes.update(lineage["nodes"])
                 lineage_edges.extend(lineage["edges"])
 
         return {
             "traceability": traceability_rows,
-            "statement_summary": [trace.__dict__ for trace in traces],
+            "statement_summary": traces,
             "lineage": {
                 "nodes": sorted(lineage_nodes),
                 "edges": lineage_edges,
             },
         }
 
+    def _analyze_statement(
+        self, statement: str
+    ) -> Tuple[Dict[str, object], List[Dict[str, object]], Dict[str, object]]:
+        normalized = self._normalize(statement)
+        action = self._detect_action(statement, normalized)
+        category = self._detect_category(action)
+        objects = self._extract_objects(statement, action, normalized)
+        clauses = self._detect_clauses(statement, normalized)
+        functions = self._detect_functions(statement, normalized)
+
+        # Shaped like TraceResult; built directly to skip the dataclass
+        # round-trip through __dict__ in the hot loop.
+        trace = {
+            "statement": statement,
+            "category": category,
+            "action": action,
+            "objects": objects,
+            "clauses": clauses,
+            "functions": functions,
+        }
+        # Fast-reject: traceability needs a SELECT to match anything, and
+        # lineage needs a target-producing action with at least one object.
+        if "SELECT" in normalized:
+            traceability_rows = self._traceability.analyze(statement)
+        else:
+            traceability_rows = []
+        if action in self._LINEAGE_ACTIONS and objects:
+            lineage = self._lineage.analyze(statement, action, objects, normalized)
+        else:
+            lineage = {}
+        return trace, traceability_rows, lineage
+
     def _split_statements(self, sql_text: str) -> List[str]:
-        cleaned = sql_text.replace("\n", " ")
-        statements = [segment.strip() for segment in cleaned.split(";")]
-        return [statement for statement in statements if statement]
+        statements: List[str] = []
+        for match in _STMT_RE.finditer(sql_text):
+            statement = match.group().strip()
+            if statement:
+                statements.append(statement)
+        return statements
 
-    def _detect_action(self, statement: str) -> str:
-        normalized = self._normalize(statement)
-        priorities = (
-            sorted(self.UTILITY_ACTIONS, key=len, reverse=True)
-            + sorted(self.TCL_ACTIONS, key=len, reverse=True)
-            + sorted(self.DDL_ACTIONS, key=len, reverse=True)
-            + sorted(self.DML_ACTIONS, key=len, reverse=True)
-            + sorted(self.DCL_ACTIONS, key=len, reverse=True)
-        )
-        for keyword in priorities:
-            if normalized.startswith(keyword):
-                return keyword
+    def _detect_action(self, statement: str, normalized: Optional[str] = None) -> str:
+        if normalized is None:
+            normalized = self._normalize(statement)
+        # Walk the keyword trie over at most len(longest keyword) chars,
+        # remembering the longest accept that ends on a word boundary.
+        node = self._ACTION_TRIE
+        best: Optional[str] = None
+        for char in normalized:
+            keyword = node.get("$")
+            if keyword is not None and not (char.isalnum() or char == "_"):
+                best = keyword
+            next_node = node.get(char)
+            if next_node is None:
+                break
+            node = next_node
+        else:
+            keyword = node.get("$")
+            if keyword is not None:
+                best = keyword
+        if best is not None:
+            return best
         return normalized.split(" ")[0] if normalized else "UNKNOWN"
 
     def _detect_category(self, action: str) -> str:
-        if action in self.DDL_ACTIONS:
-            return "DDL"
-        if action in self.DML_ACTIONS:
-            return "DML"
-        if action in self.DCL_ACTIONS:
-            return "DCL"
-        if action in self.TCL_ACTIONS:
-            return "TCL"
-        if action in self.UTILITY_ACTIONS:
-            return "UTILITY"
-        return "UNKNOWN"
-
-    def _extract_objects(self, statement: str, action: str) -> List[str]:
-        patterns = {
-            "CREATE TABLE": r"CREATE\s+TABLE\s+([^\s(]+)",
-            "DROP TABLE": r"DROP\s+TABLE\s+([^\s;]+)",
-            "TRUNCATE TABLE": r"TRUNCATE\s+TABLE\s+([^\s;]+)",
-            "ALTER TABLE": r"ALTER\s+TABLE\s+([^\s;]+)",
-            "RENAME TABLE": r"RENAME\s+TABLE\s+([^\s;]+)",
-            "CREATE VIEW": r"CREATE\s+VIEW\s+([^\s;]+)",
-            "DROP VIEW": r"DROP\s+VIEW\s+([^\s;]+)",
-            "CREATE INDEX": r"CREATE\s+INDEX\s+([^\s;]+)",
-            "DROP INDEX": r"DROP\s+INDEX\s+([^\s;]+)",
-            "CREATE SEQUENCE": r"CREATE\s+SEQUENCE\s+([^\s;]+)",
-            "DROP SEQUENCE": r"DROP\s+SEQUENCE\s+([^\s;]+)",
-            "CREATE FUNCTION": r"CREATE\s+FUNCTION\s+([^\s(]+)",
-            "DROP FUNCTION": r"DROP\s+FUNCTION\s+([^\s(]+)",
-            "CREATE PROCEDURE": r"CREATE\s+PROCEDURE\s+([^\s(]+)",
-            "DROP PROCEDURE": r"DROP\s+PROCEDURE\s+([^\s(]+)",
-            "CREATE TRIGGER": r"CREATE\s+TRIGGER\s+([^\s;]+)",
-            "DROP TRIGGER": r"DROP\s+TRIGGER\s+([^\s;]+)",
-            "CREATE DATABASE": r"CREATE\s+DATABASE\s+([^\s;]+)",
-            "DROP DATABASE": r"DROP\s+DATABASE\s+([^\s;]+)",
-            "CREATE SCHEMA": r"CREATE\s+SCHEMA\s+([^\s;]+)",
-            "DROP SCHEMA": r"DROP\s+SCHEMA\s+([^\s;]+)",
-            "INSERT": r"INSERT\s+INTO\s+([^\s(]+)",
-            "UPDATE": r"UPDATE\s+([^\s;]+)",
-            "DELETE": r"DELETE\s+FROM\s+([^\s;]+)",
-            "MERGE": r"MERGE\s+INTO\s+([^\s;]+)",
-            "SELECT": r"FROM\s+([^\s,;]+)",
-            "GRANT": r"GRANT\s+[^\s]+\s+ON\s+([^\s;]+)",
-            "REVOKE": r"REVOKE\s+[^\s]+\s+ON\s+([^\s;]+)",
-            "DESCRIBE": r"DESCRIBE\s+([^\s;]+)",
-            "EXPLAIN": r"EXPLAIN\s+([^\s;]+)",
-            "EXPLAIN ANALYZE": r"EXPLAIN\s+ANALYZE\s+([^\s;]+)",
-            "SHOW": r"SHOW\s+([^;]+)",
-            "USE": r"USE\s+([^;]+)",
-        }
-        statement_upper = self._normalize(statement)
+        return self._ACTION_TO_CATEGORY.get(action, "UNKNOWN")
+
+    def _extract_objects(
+        self, statement: str, action: str, normalized: Optional[str] = None
+    ) -> List[str]:
+        if normalized is None:
+            normalized = self._normalize(statement)
         results: List[str] = []
-        for key, pattern in patterns.items():
-            if action == key or (key == "SELECT" and "SELECT" in statement_upper):
-                matches = re.findall(pattern, statement_upper, flags=re.IGNORECASE)
-                results.extend(matches)
-        return list(dict.fromkeys(results))
+        pattern = _OBJECT_PATTERNS.get(action)
+        if pattern is not None:
+            results.extend(pattern.findall(normalized))
+        if action != "SELECT" and "SELECT" in normalized:
+            results.extend(_SELECT_FROM_RE.findall(normalized))
+        return dedup(results)
 
-    def _detect_clauses(self, statement: str) -> List[str]:
-        normalized = self._normalize(statement)
-        found = [clause for clause in self.CLAUSES if clause in normalized]
-        return sorted(found)
+    def _detect_clauses(self, statement: str, normalized: Optional[str] = None) -> List[str]:
+        if normalized is None:
+            normalized = self._normalize(statement)
+        # Dedup hits in an int bitmask instead of a set; one bit per clause.
+        mask = 0
+        clause_ids = self._CLAUSE_ID
+        for match in self._CLAUSE_RE.finditer(normalized):
+            mask |= 1 << clause_ids[match.group(1)]
+        if not mask:
+            return []
+        clause_list = self._CLAUSE_LIST
+        return sorted(
+            clause_list[index]
+            for index in range(len(clause_list))
+            if mask >> index & 1
+        )
 
-    def _detect_functions(self, statement: str) -> List[str]:
-        normalized = self._normalize(statement)
+    def _detect_functions(self, statement: str, normalized: Optional[str] = None) -> List[str]:
+        if normalized is None:
+            normalized = self._normalize(statement)
+        if _FN_AUTOMATON is not None:
+            return self._detect_functions_automaton(normalized)
         found: List[str] = []
         for func in self.FUNCTIONS:
-            if func in {"CURRENT_DATE", "CURRENT_TIME", "CURRENT_TIMESTAMP"}:
+            if func in _TIME_CONSTANTS:
                 if func in normalized:
                     found.append(func)
             else:
-                if re.search(rf"\b{re.escape(func)}\s*\(", normalized):
+                if _FUNCTION_CALL_RES[func].search(normalized):
                     found.append(func)
         return sorted(set(found))
 
+    @staticmethod
+    def _detect_functions_automaton(normalized: str) -> List[str]:
+        found: Set[str] = set()
+        length = len(normalized)
+        for end, (size, name) in _FN_AUTOMATON.iter(normalized):
+            if name in _TIME_CONSTANTS:
+                found.add(name)
+                continue
+            start = end - size + 1
+            if start > 0 and (normalized[start - 1].isalnum() or normalized[start - 1] == "_"):
+                continue
+            pos = end + 1
+            while pos < length and normalized[pos] == " ":
+                pos += 1
+            if pos < length and normalized[pos] == "(":
+                found.add(name)
+        return sorted(found)
+
     @staticmethod
     def _normalize(statement: str) -> str:
-        return re.sub(r"\s+", " ", statement.strip()).upper()
+        return _WS_RE.sub(" ", statement.strip()).upper()
+
+
+_TIME_CONSTANTS = frozenset({"CURRENT_DATE", "CURRENT_TIME", "CURRENT_TIMESTAMP"})
+
+_FUNCTION_CALL_RES = {
+    func: compile_pattern(rf"\b{re.escape(func)}\s*\(")
+    for func in SqlTraceModel.FUNCTIONS
+}
+
+if ahocorasick is not None:
+    _FN_AUTOMATON = ahocorasick.Automaton()
+    for _function in SqlTraceModel.FUNCTIONS:
+        _FN_AUTOMATON.add_word(_function, (len(_function), _function))
+    _FN_AUTOMATON.make_automaton()
+else:
+    _FN_AUTOMATON = None
+
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_WORKER_MODEL: Optional[SqlTraceModel] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _EXECUTOR
+
+
+def _analyze_statement_worker(
+    statement: str,
+) -> Tuple[Dict[str, object], List[Dict[str, object]], Dict[str, object]]:
+    global _WORKER_MODEL
+    if _WORKER_MODEL is None:
+        _WORKER_MODEL = SqlTraceModel()
+    return _WORKER_MODEL._analyze_statement(statement)
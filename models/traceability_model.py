@@ -2,6 +2,56 @@ import re
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+from models.regex_compat import compile_pattern
+
+_WS_RE = compile_pattern(r"\s+")
+_SQL_KW_RE = compile_pattern(
+    r"\b(SELECT|FROM|WHERE|GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT|OFFSET)\b",
+    re.IGNORECASE,
+)
+_SOURCE_RE = compile_pattern(
+    r"(?:FROM|JOIN)\s+([^\s,]+)(?:\s+(?:AS\s+)?([^\s,]+))?",
+    re.IGNORECASE,
+)
+_ALIAS_RE = compile_pattern(r"\s+AS\s+([^\s]+)$", re.IGNORECASE)
+_SCHEMA_TABLE_COLUMN_RE = compile_pattern(
+    r"([A-Za-z_][\w]*)\.([A-Za-z_][\w]*)\.([A-Za-z_][\w]*)"
+)
+_TABLE_COLUMN_RE = compile_pattern(r"([A-Za-z_][\w]*)\.([A-Za-z_][\w]*)")
+_COLUMN_RE = compile_pattern(r"\b([A-Za-z_][\w]*)\b")
+_PAREN_COMMA_RE = compile_pattern(r"[(),]")
+
+# Fastest available depth-0 comma scanner: the compiled Cython extension,
+# then the Numba JIT, then None (regex path in _split_select_items).
+try:
+    from models.sql_trace_fast import comma_offsets as _comma_offsets
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        from numba import njit
+    except ImportError:
+        njit = None
+
+    if njit is not None:
+
+        @njit(cache=True)
+        def _comma_offsets(buf):
+            # Byte offsets of commas at paren depth 0; 40/41/44 are ( ) ,
+            offsets = []
+            depth = 0
+            for index in range(len(buf)):
+                char = buf[index]
+                if char == 40:
+                    depth += 1
+                elif char == 41:
+                    if depth > 0:
+                        depth -= 1
+                elif char == 44 and depth == 0:
+                    offsets.append(index)
+            return offsets
+
+    else:
+        _comma_offsets = None
+
 
 @dataclass
 class TraceabilityRow:
@@ -16,10 +66,13 @@ class TraceabilityRow:
 
 
 class TraceabilityModel:
-    DEST_PATTERNS = (
-        r"INSERT\s+INTO\s+(?P<dest>[^\s(]+)\s*(?:\((?P<dest_cols>[^)]*)\))?",
-        r"CREATE\s+TABLE\s+(?P<dest>[^\s(]+).*?\s+AS",
-        r"CREATE\s+VIEW\s+(?P<dest>[^\s(]+).*?\s+AS",
+    DEST_PATTERNS = tuple(
+        compile_pattern(pattern, re.IGNORECASE | re.DOTALL)
+        for pattern in (
+            r"INSERT\s+INTO\s+(?P<dest>[^\s(]+)\s*(?:\((?P<dest_cols>[^)]*)\))?",
+            r"CREATE\s+TABLE\s+(?P<dest>[^\s(]+).*?\s+AS",
+            r"CREATE\s+VIEW\s+(?P<dest>[^\s(]+).*?\s+AS",
+        )
     )
 
     def analyze(self, statement: str) -> List[Dict[str, object]]:
@@ -32,7 +85,7 @@ class TraceabilityModel:
         dest_table, dest_columns = self._extract_destination(statement)
         dest_schema, dest_table_name = self._split_identifier(dest_table) if dest_table else (None, None)
 
-        rows: List[TraceabilityRow] = []
+        rows: List[Dict[str, object]] = []
         select_items = self._split_select_items(select_list)
         for index, item in enumerate(select_items):
             expression, alias = self._split_alias(item)
@@ -49,24 +102,26 @@ class TraceabilityModel:
             else:
                 destination_field = source_field
 
+            # Shaped like TraceabilityRow; built directly to skip the
+            # dataclass round-trip through __dict__ in the hot loop.
             rows.append(
-                TraceabilityRow(
-                    source_schema=source_schema,
-                    source_table=source_table,
-                    source_field=source_field,
-                    destination_schema=dest_schema,
-                    destination_table=dest_table_name,
-                    destination_field=destination_field,
-                    logic=expression.strip(),
-                    filter=where_clause,
-                )
+                {
+                    "source_schema": source_schema,
+                    "source_table": source_table,
+                    "source_field": source_field,
+                    "destination_schema": dest_schema,
+                    "destination_table": dest_table_name,
+                    "destination_field": destination_field,
+                    "logic": expression.strip(),
+                    "filter": where_clause,
+                }
             )
 
-        return [row.__dict__ for row in rows]
+        return rows
 
     def _extract_destination(self, statement: str) -> Tuple[Optional[str], Optional[List[str]]]:
         for pattern in self.DEST_PATTERNS:
-            match = re.search(pattern, statement, flags=re.IGNORECASE | re.DOTALL)
+            match = pattern.search(statement)
             if match:
                 dest = match.group("dest")
                 dest_cols = match.groupdict().get("dest_cols")
@@ -77,57 +132,110 @@ class TraceabilityModel:
         return None, None
 
     def _extract_select(self, statement: str) -> Optional[Tuple[str, str, Optional[str]]]:
-        match = re.search(
-            r"SELECT\s+(?P<select>.+?)\s+FROM\s+(?P<from>.+?)(?:\s+WHERE\s+(?P<where>.+?))?(?:\s+GROUP\s+BY|\s+HAVING|\s+ORDER\s+BY|\s+LIMIT|\s+OFFSET|;|$)",
-            statement,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-        if not match:
+        keywords: List[Tuple[str, int, int]] = [
+            (_WS_RE.sub(" ", match.group(1)).upper(), match.start(), match.end())
+            for match in _SQL_KW_RE.finditer(statement)
+        ]
+
+        select_idx = None
+        for index, (keyword, _, _) in enumerate(keywords):
+            if keyword == "SELECT":
+                select_idx = index
+                break
+        if select_idx is None:
             return None
-        select_list = match.group("select").strip()
-        from_section = match.group("from").strip()
-        where_clause = match.group("where")
-        if where_clause:
-            where_clause = where_clause.strip()
+
+        from_idx = None
+        for index in range(select_idx + 1, len(keywords)):
+            if keywords[index][0] == "FROM":
+                from_idx = index
+                break
+        if from_idx is None:
+            return None
+
+        select_list = statement[keywords[select_idx][2] : keywords[from_idx][1]].strip()
+
+        end = statement.find(";", keywords[from_idx][2])
+        if end == -1:
+            end = len(statement)
+
+        where_idx = None
+        from_end = end
+        for index in range(from_idx + 1, len(keywords)):
+            keyword, start, _ = keywords[index]
+            if start >= end:
+                break
+            if keyword in ("SELECT", "FROM"):
+                continue
+            from_end = start
+            if keyword == "WHERE":
+                where_idx = index
+            break
+
+        from_section = statement[keywords[from_idx][2] : from_end].strip()
+        if not select_list or not from_section:
+            return None
+
+        where_clause = None
+        if where_idx is not None:
+            where_end = end
+            for index in range(where_idx + 1, len(keywords)):
+                keyword, start, _ = keywords[index]
+                if start >= end:
+                    break
+                if keyword in ("SELECT", "FROM", "WHERE"):
+                    continue
+                where_end = start
+                break
+            where_clause = statement[keywords[where_idx][2] : where_end].strip() or None
+
         return select_list, from_section, where_clause
 
     def _extract_sources(self, from_section: str) -> Tuple[Dict[str, str], List[str]]:
         alias_map: Dict[str, str] = {}
         sources: List[str] = []
-        for table, alias in re.findall(
-            r"(?:FROM|JOIN)\s+([^\s,]+)(?:\s+(?:AS\s+)?([^\s,]+))?",
-            from_section,
-            flags=re.IGNORECASE,
-        ):
+        for table, alias in _SOURCE_RE.findall(from_section):
             sources.append(table)
             if alias:
                 alias_map[alias] = table
         return alias_map, sources
 
     def _split_select_items(self, select_list: str) -> List[str]:
+        if _comma_offsets is not None:
+            buf = select_list.encode("utf-8")
+            items = []
+            last = 0
+            for offset in _comma_offsets(buf):
+                item = buf[last:offset].decode("utf-8").strip()
+                if item:
+                    items.append(item)
+                last = offset + 1
+            tail = buf[last:].decode("utf-8").strip()
+            if tail:
+                items.append(tail)
+            return items
+
         items: List[str] = []
-        current: List[str] = []
         depth = 0
-        for char in select_list:
+        last = 0
+        for match in _PAREN_COMMA_RE.finditer(select_list):
+            char = match.group()
             if char == "(":
                 depth += 1
             elif char == ")":
                 depth = max(depth - 1, 0)
-            if char == "," and depth == 0:
-                item = "".join(current).strip()
+            elif depth == 0:
+                item = select_list[last : match.start()].strip()
                 if item:
                     items.append(item)
-                current = []
-            else:
-                current.append(char)
-        if current:
-            item = "".join(current).strip()
-            if item:
-                items.append(item)
+                last = match.end()
+        tail = select_list[last:].strip()
+        if tail:
+            items.append(tail)
         return items
 
     def _split_alias(self, item: str) -> Tuple[str, Optional[str]]:
-        match = re.search(r"\s+AS\s+([^\s]+)$", item, flags=re.IGNORECASE)
+        match = _ALIAS_RE.search(item)
         if match:
             alias = match.group(1).strip()
             expression = item[: match.start()].strip()
@@ -143,15 +251,12 @@ class TraceabilityModel:
         alias_map: Dict[str, str],
         sources: List[str],
     ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-        schema_table_column = re.search(
-            r"([A-Za-z_][\w]*)\.([A-Za-z_][\w]*)\.([A-Za-z_][\w]*)",
-            expression,
-        )
+        schema_table_column = _SCHEMA_TABLE_COLUMN_RE.search(expression)
         if schema_table_column:
             schema, table, column = schema_table_column.groups()
             return schema, table, column
 
-        table_column = re.search(r"([A-Za-z_][\w]*)\.([A-Za-z_][\w]*)", expression)
+        table_column = _TABLE_COLUMN_RE.search(expression)
         if table_column:
             qualifier, column = table_column.groups()
             table_ref = alias_map.get(qualifier, qualifier)
@@ -160,7 +265,7 @@ class TraceabilityModel:
 
         if sources:
             schema, table = self._split_identifier(sources[0])
-            column_match = re.search(r"\b([A-Za-z_][\w]*)\b", expression)
+            column_match = _COLUMN_RE.search(expression)
             column = column_match.group(1) if column_match else None
             return schema, table, column
 
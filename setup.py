@@ -0,0 +1,16 @@
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
+ext_modules = []
+if cythonize is not None:
+    ext_modules = cythonize("models/sql_trace_fast.pyx", language_level=3)
+
+setup(
+    name="dattracer-global",
+    version="0.1.0",
+    ext_modules=ext_modules,
+)